@@ -14,6 +14,7 @@ from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy.ext.asyncio import async_engine_from_config
+from sqlalchemy.pool import NullPool
 
 from app.db.database import DATABASE_URL, Base
 from app.models import user, task
@@ -49,19 +50,35 @@ def do_run_migrations(connection):
         context.run_migrations()
 
 
-async def run_migrations_online():
-    """Запуск миграций в online-режиме с подключением к БД."""
+async def run_async_migrations():
+    """Запуск миграций через временный асинхронный движок без пула соединений."""
     connectable = async_engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
-        poolclass=None,
+        poolclass=NullPool,
     )
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
     await connectable.dispose()
 
 
+def run_migrations_online():
+    """
+    Запуск миграций в online-режиме с подключением к БД.
+
+    Если вызывающий код передал готовое соединение через
+    `config.attributes["connection"]` (например, тестовая фикстура),
+    миграции выполняются на нём без создания нового движка и цикла событий.
+    """
+    connection = config.attributes.get("connection")
+
+    if connection is None:
+        asyncio.run(run_async_migrations())
+    else:
+        do_run_migrations(connection)
+
+
 if context.is_offline_mode():
     run_migrations_offline()
 else:
-    asyncio.run(run_migrations_online())
+    run_migrations_online()
@@ -0,0 +1,40 @@
+"""Add covering index on tasks(user_id, id)
+
+Revision ID: 3f1d9a7c2b64
+Revises: 60129cee0a45
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1d9a7c2b64'
+down_revision: Union[str, None] = '60129cee0a45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_id',
+            'tasks',
+            ['user_id', 'id'],
+            unique=False,
+            postgresql_include=['title', 'description', 'status'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_user_id_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
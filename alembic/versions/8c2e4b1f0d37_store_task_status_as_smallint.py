@@ -0,0 +1,45 @@
+"""Store task status as smallint
+
+Revision ID: 8c2e4b1f0d37
+Revises: 3f1d9a7c2b64
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e4b1f0d37'
+down_revision: Union[str, None] = '3f1d9a7c2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "ALTER TABLE tasks ALTER COLUMN status TYPE smallint USING ("
+        "CASE status "
+        "WHEN 'NEW' THEN 0 "
+        "WHEN 'IN_PROGRESS' THEN 1 "
+        "WHEN 'COMPLETED' THEN 2 "
+        "END)"
+    )
+    op.create_check_constraint('ck_tasks_status', 'tasks', 'status IN (0, 1, 2)')
+    op.execute("DROP TYPE status_enum")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_tasks_status', 'tasks', type_='check')
+    sa.Enum('NEW', 'IN_PROGRESS', 'COMPLETED', name='status_enum').create(op.get_bind())
+    op.execute(
+        "ALTER TABLE tasks ALTER COLUMN status TYPE status_enum USING ("
+        "CASE status "
+        "WHEN 0 THEN 'NEW' "
+        "WHEN 1 THEN 'IN_PROGRESS' "
+        "WHEN 2 THEN 'COMPLETED' "
+        "END)::status_enum"
+    )
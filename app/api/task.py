@@ -1,11 +1,13 @@
 """Маршруты API для управления задачами: создание, просмотр, обновление и удаление задач."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import SmallInteger, Text, case, cast, delete, func, literal_column, type_coerce, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.db.dependencies import get_async_session, get_current_user
-from app.models.task import Task
+from app.models.task import STATUS_BY_CODE, Task
 from app.models.user import User
 from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
 
@@ -42,12 +44,12 @@ async def get_task_checked(
     return task
 
 
-@router.post("/tasks", status_code=status.HTTP_201_CREATED, summary="Создание задачи")
+@router.post("/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED, summary="Создание задачи")
 async def create_task(
         task: TaskCreate,
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
-) -> TaskRead:
+) -> Task:
     """
     Создание новой задачи для текущего пользователя.
 
@@ -57,7 +59,7 @@ async def create_task(
         current_user (User): Аутентифицированный пользователь.
 
     Возвращает:
-        TaskRead: Данные созданной задачи.
+        Task: Созданная задача (сериализуется по схеме TaskRead).
     """
     new_task = Task(
         title=task.title,
@@ -68,32 +70,51 @@ async def create_task(
 
     session.add(new_task)
     await session.commit()
-    await session.refresh(new_task)
 
-    return TaskRead.model_validate(new_task)
+    return new_task
 
 
-@router.get("/tasks", summary="Получение всех задач пользователя")
+@router.get("/tasks", response_model=list[TaskRead], summary="Получение всех задач пользователя")
 async def read_tasks(
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
-) -> list[TaskRead]:
+) -> Response:
     """
     Получение списка всех задач текущего пользователя.
 
+    JSON-массив собирается на стороне PostgreSQL (json_agg) и отдаётся клиенту
+    как есть, без создания Python-объектов и валидации Pydantic.
+
     Аргументы:
         session (AsyncSession): Сессия базы данных.
         current_user (User): Аутентифицированный пользователь.
 
     Возвращает:
-        list[TaskRead]: Список задач пользователя.
+        Response: JSON-список задач пользователя в формате TaskRead.
     """
-    result = await session.execute(
-        select(Task).where(Task.user_id == current_user.id)
+    task_json = func.json_build_object(
+        "id", Task.id,
+        "title", Task.title,
+        "description", Task.description,
+        "status", case(
+            {code: task_status.value for code, task_status in STATUS_BY_CODE.items()},
+            value=type_coerce(Task.status, SmallInteger),
+        ),
+        "user_id", Task.user_id,
     )
-    tasks = result.scalars().all()
+    stmt = select(
+        cast(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(task_json, Task.id)),
+                literal_column("'[]'::json"),
+            ),
+            Text,
+        )
+    ).where(Task.user_id == current_user.id)
+
+    body = await session.scalar(stmt)
 
-    return [TaskRead.model_validate(task) for task in tasks]
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/tasks/{task_id}", summary="Получение задачи по ID")
@@ -121,13 +142,13 @@ async def read_task(
     return TaskRead.model_validate(task)
 
 
-@router.put("/tasks/{task_id}", summary="Обновление задач по ID")
+@router.put("/tasks/{task_id}", response_model=TaskRead, summary="Обновление задач по ID")
 async def update_task(
         task_id: int,
         task_update: TaskUpdate,
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
-) -> TaskRead:
+) -> Task:
     """
     Обновление задачи по её ID.
 
@@ -138,24 +159,32 @@ async def update_task(
         current_user (User): Аутентифицированный пользователь.
 
     Возвращает:
-        TaskRead: Обновленные данные задачи.
+        Task: Обновлённая задача (сериализуется по схеме TaskRead).
 
     Исключения:
         HTTPException: 404 если задача не найдена, 403 если нет прав доступа.
     """
-    task = await get_task_checked(task_id, session, current_user)
+    values = task_update.model_dump(exclude_none=True)
+
+    if not values:
+        return await get_task_checked(task_id, session, current_user)
 
-    if task_update.title is not None:
-        task.title = task_update.title
-    if task_update.description is not None:
-        task.description = task_update.description
-    if task_update.status is not None:
-        task.status = task_update.status
+    result = await session.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(**values)
+        .returning(Task)
+    )
+    task = result.scalar_one_or_none()
+
+    if not task:
+        # Ни одна строка не обновлена: выясняем, нет задачи (404) или нет прав (403)
+        await get_task_checked(task_id, session, current_user)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена")
 
     await session.commit()
-    await session.refresh(task)
 
-    return TaskRead.model_validate(task)
+    return task
 
 
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Удаление задачи по её ID")
@@ -175,7 +204,15 @@ async def delete_task(
     Исключения:
         HTTPException: 404 если задача не найдена, 403 если нет прав доступа.
     """
-    task = await get_task_checked(task_id, session, current_user)
+    result = await session.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .returning(Task.id)
+    )
+
+    if result.scalar_one_or_none() is None:
+        # Ни одна строка не удалена: выясняем, нет задачи (404) или нет прав (403)
+        await get_task_checked(task_id, session, current_user)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена")
 
-    await session.delete(task)
     await session.commit()
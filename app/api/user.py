@@ -3,16 +3,20 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, HTTPException, status, Depends, Response, Form
-from jose import jwt
-from jose.exceptions import JWTError, ExpiredSignatureError
-from passlib.hash import bcrypt
+from fastapi.responses import ORJSONResponse
+import jwt
+from jwt import ExpiredSignatureError, InvalidTokenError
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.auth import create_access_token, create_refresh_token
 from app.core.config import settings
-from app.db.dependencies import get_async_session, get_current_user
+from app.core.security import hash_password, verify_and_update_password
+from app.db.dependencies import get_async_session, get_current_user, invalidate_user_cache
+from app.models.task import Task
 from app.models.user import User
 from app.schemas.token import RefreshTokenRequest, TokenResponse
 from app.schemas.user import UserCreate, UpdateUserRequest, UserRead, UpdateUserResponse
@@ -20,12 +24,12 @@ from app.schemas.user import UserCreate, UpdateUserRequest, UserRead, UpdateUser
 router = APIRouter(tags=["Users"])
 
 
-@router.post("/users/register", status_code=status.HTTP_201_CREATED,
+@router.post("/users/register", response_model=UserRead, status_code=status.HTTP_201_CREATED,
              summary="Регистрация пользователя")
 async def register_user(
         user: UserCreate,
         session: AsyncSession = Depends(get_async_session)
-) -> UserRead:
+) -> User:
     """
     Регистрация нового пользователя.
 
@@ -34,49 +38,53 @@ async def register_user(
         session (AsyncSession): Сессия базы данных.
 
     Возвращает:
-        UserRead: Информация о зарегистрированном пользователе.
+        User: Зарегистрированный пользователь (сериализуется по схеме UserRead).
 
     Исключения:
         HTTPException: 409, если пользователь с таким email или username уже существует.
     """
-    stmt = select(User).where((User.email == user.email) | (User.username == user.username))
-    result = await session.execute(stmt)
+    # Вставка с проверкой уникальности за один запрос: при конфликте строка не возвращается
+    stmt = (
+        insert(User)
+        .values(
+            username=user.username,
+            email=user.email,
+            hashed_password=await hash_password(user.password.get_secret_value())
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
+    )
+    new_user = (await session.execute(stmt)).scalar_one_or_none()
 
-    if result.scalar_one_or_none():
+    if new_user is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Пользователь с таким email или именем уже существует"
         )
 
-    new_user = User(
-        username=user.username,
-        email=user.email,
-        hashed_password=bcrypt.hash(user.password.get_secret_value())
-    )
-
-    session.add(new_user)
     await session.commit()
-    await session.refresh(new_user)
 
-    return UserRead.model_validate(new_user)
+    return new_user
 
 
-@router.post("/users/login", summary="Авторизация пользователя")
+@router.post("/users/login", response_model=TokenResponse, summary="Авторизация пользователя")
 async def login(
         username: str = Form(...),
         password: str = Form(...),
         session: AsyncSession = Depends(get_async_session)
-) -> dict:
+) -> ORJSONResponse:
     """
     Авторизация пользователя и получение JWT access и refresh токенов.
 
+    Если пароль хранится устаревшим алгоритмом (bcrypt), хеш заменяется на argon2.
+
     Аргументы:
         username (str): Имя пользователя.
         password (str): Пароль пользователя.
         session (AsyncSession): Сессия базы данных.
 
     Возвращает:
-        dict: Словарь с access и refresh токенами, а также типом токена.
+        ORJSONResponse: TokenResponse с access и refresh токенами, а также типом токена.
 
     Исключения:
         HTTPException: 401, если имя пользователя или пароль неверны.
@@ -85,12 +93,24 @@ async def login(
     result = await session.execute(stmt)
     existing_user = result.scalar_one_or_none()
 
-    if not existing_user or not bcrypt.verify(password, existing_user.hashed_password):
+    if not existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Неверное имя пользователя или пароль"
+        )
+
+    verified, new_hash = await verify_and_update_password(password, existing_user.hashed_password)
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверное имя пользователя или пароль"
         )
 
+    if new_hash:
+        existing_user.hashed_password = new_hash
+        await session.commit()
+
     token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
@@ -104,18 +124,19 @@ async def login(
         expires_delta=refresh_expires
     )
 
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer"
-    }
+    return ORJSONResponse(TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer"
+    ))
 
 
-@router.post("/users/refresh", summary="Обновление access токена по refresh токену")
+@router.post("/users/refresh", response_model=TokenResponse,
+             summary="Обновление access токена по refresh токену")
 async def refresh_token(
         request: RefreshTokenRequest,
         session: AsyncSession = Depends(get_async_session)
-) -> TokenResponse:
+) -> ORJSONResponse:
     """
     Обновление access токена по действующему refresh токену.
 
@@ -124,7 +145,7 @@ async def refresh_token(
         session (AsyncSession): Сессия базы данных.
 
     Возвращает:
-        TokenResponse: Новый access токен и его тип.
+        ORJSONResponse: TokenResponse с новым access токеном и его типом.
 
     Исключения:
         HTTPException: 401, если токен истёк, недействителен или пользователь не найден.
@@ -134,7 +155,7 @@ async def refresh_token(
         user_id: int = int(payload.get("sub"))
     except ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Срок действия refresh токена истёк")
-    except (JWTError, ValueError):
+    except (InvalidTokenError, TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверный refresh токен")
 
     user = await session.get(User, user_id)
@@ -145,11 +166,11 @@ async def refresh_token(
     access_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     new_access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=access_expires)
 
-    return TokenResponse(access_token=new_access_token, token_type="bearer")
+    return ORJSONResponse(TokenResponse(access_token=new_access_token, token_type="bearer"))
 
 
-@router.get("/users/me", summary="Получение текущего пользователя")
-async def read_users_me(current_user: User = Depends(get_current_user)) -> UserRead:
+@router.get("/users/me", response_model=UserRead, summary="Получение текущего пользователя")
+async def read_users_me(current_user: User = Depends(get_current_user)) -> User:
     """
     Получение информации о текущем авторизованном пользователе.
 
@@ -157,17 +178,17 @@ async def read_users_me(current_user: User = Depends(get_current_user)) -> UserR
         current_user (User): Объект текущего пользователя.
 
     Возвращает:
-        UserRead: Данные текущего пользователя.
+        User: Текущий пользователь (сериализуется по схеме UserRead).
     """
-    return UserRead.model_validate(current_user)
+    return current_user
 
 
-@router.get("/users/{user_id}", summary="Получение пользователя по ID")
+@router.get("/users/{user_id}", response_model=UserRead, summary="Получение пользователя по ID")
 async def get_user(
         user_id: int,
         current_user: User = Depends(get_current_user),
         session: AsyncSession = Depends(get_async_session)
-) -> UserRead:
+) -> User:
     """
     Получение информации о пользователе по его ID (только самому себе).
 
@@ -177,46 +198,53 @@ async def get_user(
         session (AsyncSession): Сессия базы данных.
 
     Возвращает:
-        UserRead: Данные пользователя.
+        User: Найденный пользователь (сериализуется по схеме UserRead).
 
     Исключения:
         HTTPException: 404, если пользователь не найден.
     """
-    user = await session.get(User, user_id)
+    if user_id == current_user.id:
+        user = current_user
+    else:
+        user = await session.get(User, user_id)
 
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Пользователь не найден")
 
-    return UserRead.model_validate(user)
+    return user
 
 
-@router.get("/users", summary="Получение всех пользователей")
+@router.get("/users", response_model=list[UserRead], summary="Получение всех пользователей")
 async def get_users(
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user),
-) -> list[UserRead]:
+) -> ORJSONResponse:
     """
     Получение списка всех пользователей.
 
+    Выбираются только поля UserRead, и строки результата сразу сериализуются
+    в JSON, минуя ORM-объекты и Pydantic.
+
     Аргументы:
         session (AsyncSession): Сессия базы данных.
         current_user (User): Аутентифицированный пользователь.
 
     Возвращает:
-        list[UserRead]: Список пользователей.
+        ORJSONResponse: JSON-список пользователей в формате UserRead, упорядоченный по ID.
     """
-    result = await session.execute(select(User))
-    users = result.scalars().all()
-    return [UserRead.model_validate(user) for user in users]
+    result = await session.execute(select(User.id, User.username, User.email).order_by(User.id))
+
+    return ORJSONResponse([dict(row._mapping) for row in result.all()])
 
 
-@router.put("/users/{user_id}", summary="Обновление пользователя по ID")
+@router.put("/users/{user_id}", response_model=UpdateUserResponse, response_model_exclude_none=True,
+            summary="Обновление пользователя по ID")
 async def update_user(
         user_id: int,
         user_update: UpdateUserRequest,
         current_user: User = Depends(get_current_user),
         session: AsyncSession = Depends(get_async_session)
-) -> UpdateUserResponse:
+) -> dict:
     """
     Обновление данных пользователя по его ID (только самому себе).
 
@@ -227,7 +255,7 @@ async def update_user(
         session (AsyncSession): Сессия базы данных.
 
     Возвращает:
-        UpdateUserResponse: Результат обновления.
+        dict: Сообщение и обновлённый пользователь (сериализуется по схеме UpdateUserResponse).
 
     Исключения:
         HTTPException: 403 при попытке обновить чужие данные, 404 если пользователь не найден,
@@ -237,28 +265,35 @@ async def update_user(
     if user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Доступ запрещён")
 
-    user = await session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Пользователь не найден")
+    values = user_update.model_dump(exclude_none=True)
+    if "password" in values:
+        values["hashed_password"] = await hash_password(values.pop("password").get_secret_value())
 
-    for field, value in user_update.model_dump(exclude_unset=True).items():
-        setattr(user, field, value)
+    user = current_user
 
-    try:
-        await session.commit()
-    except IntegrityError as e:
-        await session.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Имя пользователя или email уже заняты"
-        )
+    if values:
+        try:
+            result = await session.execute(
+                update(User).where(User.id == user_id).values(**values).returning(User)
+            )
+            user = result.scalar_one_or_none()
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Имя пользователя или email уже заняты"
+            )
 
-    await session.refresh(user)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Пользователь не найден")
 
-    return UpdateUserResponse(
-        message="Успешное обновление данных пользователя",
-        user=UserRead.model_validate(user)
-    )
+        invalidate_user_cache(user_id)
+
+    return {
+        "message": "Успешное обновление данных пользователя",
+        "user": user
+    }
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Удаление пользователя по ID")
@@ -284,12 +319,14 @@ async def delete_user(
     if user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Доступ запрещён")
 
-    user = await session.get(User, user_id)
+    # Задачи удаляются одним запросом вместо поштучного каскада ORM
+    await session.execute(delete(Task).where(Task.user_id == user_id))
+    result = await session.execute(delete(User).where(User.id == user_id).returning(User.id))
 
-    if not user:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Пользователь не найден")
 
-    await session.delete(user)
     await session.commit()
+    invalidate_user_cache(user_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
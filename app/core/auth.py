@@ -11,7 +11,7 @@
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from jose import jwt
+import jwt
 
 from app.core.config import settings
 
@@ -32,7 +32,7 @@ def create_access_token(data: dict,
     expire = datetime.now(timezone.utc) + expires_delta
     to_encode.update({
         "exp": expire,
-        "jti": str(uuid.uuid4())  # уникальный идентификатор токена
+        "jti": uuid.uuid4().hex  # уникальный идентификатор токена
     })
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
@@ -0,0 +1,48 @@
+"""
+Утилиты для хеширования и проверки паролей.
+
+Новые пароли хешируются алгоритмом argon2, ранее сохранённые bcrypt-хеши
+продолжают проверяться. Вычисление хеша выполняется в пуле потоков,
+чтобы не блокировать цикл событий на время работы медленной KDF.
+"""
+
+import asyncio
+
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+# Явно выбираются C-реализации: без них passlib молча перешёл бы на медленный
+# чистый Python (argon2pure), а так отсутствие библиотеки видно при старте
+pwd_context.handler("argon2").set_backend("argon2_cffi")
+# Требует bcrypt 4.x (см. pyproject.toml): с bcrypt 5 самопроверка passlib падает уже здесь
+pwd_context.handler("bcrypt").set_backend("bcrypt")
+
+
+async def hash_password(password: str) -> str:
+    """
+    Хеширование пароля в отдельном потоке.
+
+    Аргументы:
+        password (str): Пароль в открытом виде.
+
+    Возвращает:
+        str: Хеш пароля.
+    """
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
+async def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Проверка пароля с перехешированием устаревшего хеша в отдельном потоке.
+
+    Хеши bcrypt помечены в контексте как устаревшие (deprecated="auto"),
+    поэтому при успешной проверке для них возвращается новый хеш argon2.
+
+    Аргументы:
+        password (str): Пароль в открытом виде.
+        hashed_password (str): Хеш пароля из базы данных.
+
+    Возвращает:
+        tuple[bool, str | None]: Совпадает ли пароль, и новый хеш, если старый нужно заменить.
+    """
+    return await asyncio.to_thread(pwd_context.verify_and_update, password, hashed_password)
@@ -18,11 +18,27 @@ DATABASE_URL = (
     f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.POSTGRES_DB}"
 )
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Размер LRU-кеша подготовленных выражений на соединение в адаптере asyncpg SQLAlchemy
+# (по умолчанию 100); параметр задаётся только через строку подключения.
+PREPARED_STATEMENT_CACHE_SIZE = 1024
+
+engine = create_async_engine(
+    f"{DATABASE_URL}?prepared_statement_cache_size={PREPARED_STATEMENT_CACHE_SIZE}",
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    connect_args={
+        "server_settings": {"jit": "off"},
+        "statement_cache_size": 2048,
+    },
+)
 
 async_session_factory = async_sessionmaker(
     bind=engine,
-    expire_on_commit=False
+    expire_on_commit=False,
+    autoflush=False
 )
 
 Base = declarative_base()
@@ -3,18 +3,19 @@
 
 Содержит:
 - Получение асинхронной сессии SQLAlchemy;
-- Получение текущего пользователя по JWT токену;
+- Получение текущего пользователя по JWT токену (с кешированием в памяти процесса);
 - Обработку ошибок валидации токена и доступа.
 """
 
 from typing import AsyncGenerator
 
+from cachetools import TTLCache
 from fastapi import Depends
 from fastapi import HTTPException, status
 from fastapi import Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from jose.exceptions import ExpiredSignatureError
+import jwt
+from jwt import ExpiredSignatureError, InvalidTokenError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -38,6 +39,26 @@ class CustomHTTPBearer(HTTPBearer):
 
 security = CustomHTTPBearer()
 
+# Кеш пользователей по ID: избавляет от SELECT на каждый аутентифицированный запрос.
+# Хранятся только отсоединённые от сессий объекты; при изменении или удалении
+# пользователя запись нужно сбрасывать через invalidate_user_cache(user_id).
+user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Счётчики сбросов кеша по ID пользователя. Загрузка из БД, во время которой
+# запись сбросили, не должна вернуть в кеш устаревшего пользователя.
+_user_cache_versions: dict[int, int] = {}
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """
+    Сброс закешированного пользователя после его изменения или удаления.
+
+    Аргументы:
+        user_id (int): Идентификатор пользователя.
+    """
+    _user_cache_versions[user_id] = _user_cache_versions.get(user_id, 0) + 1
+    user_cache.pop(user_id, None)
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -57,6 +78,9 @@ async def get_current_user(
     """
     Получение текущего аутентифицированного пользователя по токену.
 
+    Пользователь кешируется по ID на 30 секунд, поэтому повторные запросы
+    с тем же токеном не обращаются к базе данных.
+
     Аргументы:
         credentials (HTTPAuthorizationCredentials): Авторизационные данные (заголовок Authorization).
         session (AsyncSession): Сессия БД.
@@ -77,17 +101,26 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Срок действия токена истёк"
         )
-    except (JWTError, ValueError):
+    except (InvalidTokenError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Не удалось проверить токен"
         )
 
-    user = await session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Пользователь не найден"
-        )
-
-    return user
+    user = user_cache.get(user_id)
+
+    if user is None:
+        version = _user_cache_versions.get(user_id, 0)
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Пользователь не найден"
+            )
+        session.expunge(user)
+        # Пока шла загрузка, пользователя могли изменить или удалить
+        if _user_cache_versions.get(user_id, 0) == version:
+            user_cache[user_id] = user
+
+    # Присоединяем копию закешированного объекта к сессии запроса без обращения к БД
+    return await session.merge(user, load=False)
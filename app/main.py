@@ -1,6 +1,7 @@
 """Главная точка входа в приложение FastAPI. Регистрирует маршруты приложения."""
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.api.task import router as tasks_router
 from app.api.user import router as users_router
@@ -8,6 +9,7 @@ from app.api.user import router as users_router
 app = FastAPI(
     title="TaskHub API",
     description="API для управления задачами и пользователями",
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(users_router)
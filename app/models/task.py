@@ -6,7 +6,8 @@
 
 from enum import Enum as PyEnum
 
-from sqlalchemy import String, ForeignKey, Enum
+from sqlalchemy import CheckConstraint, ForeignKey, Index, SmallInteger, String
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -26,6 +27,37 @@ class StatusEnum(PyEnum):
     COMPLETED = "COMPLETED"
 
 
+# Коды статусов в БД: задача хранит статус как SMALLINT вместо PostgreSQL ENUM
+STATUS_CODES = {
+    StatusEnum.NEW: 0,
+    StatusEnum.IN_PROGRESS: 1,
+    StatusEnum.COMPLETED: 2,
+}
+STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+
+
+class StatusType(TypeDecorator):
+    """
+    Тип колонки статуса: StatusEnum в Python, SMALLINT в базе данных.
+
+    При записи принимает член StatusEnum или его строковое значение.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> int | None:
+        """Преобразование статуса в код для записи в БД."""
+        if value is None:
+            return None
+        return STATUS_CODES[StatusEnum(value)]
+
+    def process_result_value(self, value, dialect) -> StatusEnum | None:
+        """Преобразование кода из БД в статус."""
+        if value is None:
+            return None
+        return STATUS_BY_CODE[value]
+
+
 class Task(Base):
     """
     Модель таблицы задач.
@@ -39,15 +71,28 @@ class Task(Base):
         user (User): Объект пользователя, связанный с задачей.
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        CheckConstraint(
+            f"status IN ({', '.join(str(code) for code in STATUS_CODES.values())})",
+            name="ck_tasks_status",
+        ),
+        # Покрывающий индекс для выборки списка задач пользователя (index-only scan)
+        Index(
+            "ix_tasks_user_id_id",
+            "user_id",
+            "id",
+            postgresql_include=["title", "description", "status"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(String(300))
     status: Mapped[StatusEnum] = mapped_column(
-        Enum(StatusEnum, name="status_enum", create_constraint=True),
+        StatusType(),
         nullable=False,
-        default=StatusEnum.NEW.value
+        default=StatusEnum.NEW
     )
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
-    user: Mapped["User"] = relationship("User", back_populates="tasks")
+    user: Mapped["User"] = relationship("User", back_populates="tasks", lazy="raise_on_sql")
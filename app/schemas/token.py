@@ -1,8 +1,11 @@
-"""Pydantic-схемы для токенов.
+"""Схемы для токенов.
 
-Содержит схемы для создания и обновления токена.
+Содержит схемы для создания и обновления токена. Запрос валидируется Pydantic,
+ответ — простой dataclass, который сериализуется orjson без участия Pydantic.
 """
 
+from dataclasses import dataclass
+
 from pydantic import BaseModel
 
 
@@ -16,7 +19,8 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
-class TokenResponse(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TokenResponse:
     """
     Схема ответа с access и refresh токенами.
 
@@ -1,8 +1,29 @@
 """Pydantic-схемы, используемые для операций с пользователями."""
 
-from typing import Optional
+from typing import Annotated
 
-from pydantic import BaseModel, EmailStr, SecretStr
+from pydantic import AfterValidator, BaseModel, ConfigDict, SecretStr, StringConstraints
+
+EMAIL_RE = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+
+def normalize_email(email: str) -> str:
+    """
+    Приводит доменную часть email к нижнему регистру, как это делал EmailStr.
+
+    Аргументы:
+        email (str): Email, уже прошедший проверку по EMAIL_RE.
+
+    Возвращает:
+        str: Email с доменом в нижнем регистре.
+    """
+    local_part, domain = email.rsplit("@", 1)
+    return f"{local_part}@{domain.lower()}"
+
+
+# Email во входящих данных проверяется регулярным выражением без email-validator;
+# домен нормализуется, чтобы уникальный индекс по email не пропускал дубликаты
+Email = Annotated[str, StringConstraints(pattern=EMAIL_RE), AfterValidator(normalize_email)]
 
 
 class UserCreate(BaseModel):
@@ -11,11 +32,11 @@ class UserCreate(BaseModel):
 
     Атрибуты:
         username (str): Имя пользователя.
-        email (EmailStr): Электронная почта пользователя.
+        email (Email): Электронная почта пользователя.
         password (str): Пароль пользователя.
     """
     username: str
-    email: EmailStr
+    email: Email
     password: SecretStr
 
 
@@ -26,19 +47,13 @@ class UserRead(BaseModel):
     Атрибуты:
         id (int): Уникальный идентификатор пользователя.
         username (str): Имя пользователя.
-        email (EmailStr): Электронная почта пользователя.
+        email (str): Электронная почта пользователя (уже проверена при записи).
     """
     id: int
     username: str
-    email: EmailStr
-
-    class Config:
-        """
-        Конфигурация для поддержки работы с ORM.
+    email: str
 
-        from_attributes (bool): Использовать атрибуты ORM для сериализации.
-        """
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UpdateUserRequest(BaseModel):
@@ -46,13 +61,13 @@ class UpdateUserRequest(BaseModel):
     Схема для обновления пользователя.
 
     Атрибуты:
-        username (Optional[str]): Новое имя пользователя.
-        email (Optional[EmailStr]): Новая электронная почта.
-        password (Optional[SecretStr]): Новый пароль пользователя.
+        username (str | None): Новое имя пользователя.
+        email (Email | None): Новая электронная почта.
+        password (SecretStr | None): Новый пароль пользователя.
     """
-    username: Optional[str] = None
-    email: Optional[EmailStr] = None
-    password: Optional[SecretStr] = None
+    username: str | None = None
+    email: Email | None = None
+    password: SecretStr | None = None
 
 
 class UpdateUserResponse(BaseModel):
@@ -1,52 +1,344 @@
 """Фикстуры и вспомогательные функции для тестирования FastAPI-приложения."""
 
+import os
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Generator
+from urllib.parse import urlencode
+
+import httpx
+import orjson
+import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from passlib.context import CryptContext
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.core import security
 from app.core.config import settings
 from app.db.database import Base
-from app.db.dependencies import get_async_session
+from app.db.dependencies import get_async_session, user_cache
 from app.main import app
+from app.models.user import User
 
+DATABASE_URL_PREFIX = (
+    f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
+    f"{settings.DB_HOST}:{settings.DB_PORT}"
+)
+BASE_TEST_DB = f"{settings.POSTGRES_DB}_TEST"
 
-@pytest_asyncio.fixture
-async def async_client() -> AsyncClient:
+# При параллельном запуске (pytest -n auto) каждый воркер xdist работает со своей базой
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_DB = f"{BASE_TEST_DB}_{XDIST_WORKER}" if XDIST_WORKER else BASE_TEST_DB
+TEST_DATABASE_URL = f"{DATABASE_URL_PREFIX}/{TEST_DB}"
+
+# Заранее созданные пользователи seed0..seed19, общие для всех тестов сессии
+SEED_USERS_COUNT = 20
+SEED_PASSWORD = "1234"
+
+
+async def create_test_database() -> None:
     """
-    Создаёт тестового клиента с отдельной тестовой базой данных.
+    Создаёт базу данных воркера xdist, если её ещё нет.
 
-    Возвращает:
-        AsyncClient: Клиент для выполнения запросов к приложению.
+    Подключение выполняется к основной тестовой базе из `init.sql`.
     """
-    TEST_DATABASE_URL = (
-        f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
-        f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.POSTGRES_DB}_TEST"
+    admin_engine = create_async_engine(
+        f"{DATABASE_URL_PREFIX}/{BASE_TEST_DB}",
+        isolation_level="AUTOCOMMIT",
+        poolclass=NullPool,
     )
 
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
-    SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    async with admin_engine.connect() as conn:
+        exists = await conn.scalar(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": TEST_DB}
+        )
+        if not exists:
+            await conn.execute(text(f'CREATE DATABASE "{TEST_DB}"'))
+
+    await admin_engine.dispose()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing() -> Generator[None, None, None]:
+    """
+    Заменяет медленную KDF (argon2/bcrypt) на дешёвый хеш на время тестов.
+
+    Хеширование паролей не является предметом тестов, а на нём держится почти
+    всё время регистрации и логина. Отключается переменной окружения
+    TASKHUB_FAST_HASH=0.
+    """
+    if os.environ.get("TASKHUB_FAST_HASH", "1") == "0":
+        yield
+        return
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "pwd_context", CryptContext(schemes=["hex_sha256"]))
+        yield
 
-    async def override_get_async_session():
-        async with SessionLocal() as session:
-            yield session
 
-    # Создание схемы базы данных
+@pytest.fixture(scope="session", autouse=True)
+def orjson_response_parsing() -> Generator[None, None, None]:
+    """Разбирает JSON ответов httpx через orjson вместо стандартного модуля json."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", lambda self, **kwargs: orjson.loads(self.content))
+        yield
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def app_warmup() -> AsyncGenerator[None, None]:
+    """
+    Запускает lifespan приложения и собирает стек middleware один раз на сессию.
+
+    Без этого сборка стека и обработчики startup выполняются внутри первого
+    теста, который обращается к приложению.
+    """
+    async with app.router.lifespan_context(app):
+        app.middleware_stack = app.build_middleware_stack()
+        yield
+
+
+@pytest_asyncio.fixture(scope="session")
+async def engine() -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Создаёт движок тестовой базы данных и схему один раз на всю сессию тестов.
+
+    Возвращает:
+        AsyncEngine: Движок тестовой базы данных.
+    """
+    if XDIST_WORKER:
+        await create_test_database()
+
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=False,
+        # Тесты внутри воркера идут последовательно и держат одно соединение
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=False,
+    )
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
 
-    # Подмена зависимости в приложении на тестовую сессию
-    app.dependency_overrides[get_async_session] = override_get_async_session
+    yield engine
 
+    await engine.dispose()
+
+
+def seed_username(idx: int) -> str:
+    """
+    Имя заранее созданного пользователя по его номеру.
+
+    Аргументы:
+        idx (int): Номер пользователя от 0 до SEED_USERS_COUNT - 1.
+
+    Возвращает:
+        str: Имя пользователя.
+    """
+    return f"seed{idx}"
+
+
+@pytest_asyncio.fixture(scope="session")
+async def seeded_users(engine: AsyncEngine, fast_password_hashing: None) -> list[int]:
+    """
+    Создаёт SEED_USERS_COUNT пользователей одним INSERT на всю сессию тестов.
+
+    Пароль у всех один (SEED_PASSWORD) и хешируется один раз. Пользователи
+    фиксируются вне транзакций тестов, поэтому откат после теста возвращает
+    их в исходное состояние, даже если тест их изменил или удалил.
+
+    Возвращает:
+        list[int]: ID пользователей; индекс списка совпадает с номером в seed_username.
+    """
+    hashed_password = await security.hash_password(SEED_PASSWORD)
+    rows = [
+        {
+            "username": seed_username(idx),
+            "email": f"{seed_username(idx)}@example.com",
+            "hashed_password": hashed_password,
+        }
+        for idx in range(SEED_USERS_COUNT)
+    ]
+
+    async with engine.begin() as conn:
+        result = await conn.execute(insert(User).values(rows).returning(User.id))
+        return sorted(result.scalars())
+
+
+@pytest.fixture(scope="session")
+def session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Создаёт фабрику тестовых сессий один раз на всю сессию тестов.
+
+    Фабрика не привязана к движку: соединение с внешней транзакцией теста
+    передаётся при создании каждой сессии.
+
+    Возвращает:
+        async_sessionmaker[AsyncSession]: Фабрика сессий.
+    """
+    return async_sessionmaker(
+        expire_on_commit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app_client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    Создаёт один HTTP-клиент приложения на всю сессию тестов.
+
+    Возвращает:
+        AsyncClient: Клиент для выполнения запросов к приложению.
+    """
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
 
+
+@pytest_asyncio.fixture
+async def db_connection(engine: AsyncEngine) -> AsyncGenerator[AsyncConnection, None]:
+    """
+    Открывает соединение с внешней транзакцией, которая откатывается после теста.
+
+    Через это же соединение работают сессии приложения, поэтому тест может
+    проверять содержимое базы прямыми запросами.
+
+    Возвращает:
+        AsyncConnection: Соединение тестовой базы данных.
+    """
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+
+        yield conn
+
+        await trans.rollback()
+
+
+@pytest_asyncio.fixture
+async def async_client(
+        db_connection: AsyncConnection,
+        seeded_users: list[int],
+        session_factory: async_sessionmaker[AsyncSession],
+        app_client: AsyncClient,
+) -> AsyncGenerator[AsyncClient, None]:
+    """
+    Подключает общего тестового клиента к базе, изолированной внешней транзакцией.
+
+    Все сессии приложения работают на одном соединении внутри транзакции,
+    а их commit фиксирует только SAVEPOINT. После теста транзакция
+    откатывается, и база возвращается в исходное состояние.
+
+    Возвращает:
+        AsyncClient: Клиент для выполнения запросов к приложению.
+    """
+    async def override_get_async_session():
+        async with session_factory(bind=db_connection) as session:
+            yield session
+
+    # Подмена зависимости в приложении на тестовую сессию
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    # Откат транзакции не затрагивает кеш пользователей, поэтому он сбрасывается
+    user_cache.clear()
+
+    yield app_client
+
     app.dependency_overrides.clear()
 
 
-async def register_and_login(client: AsyncClient, username: str, email: str, password: str) -> str:
+@dataclass
+class ASGIResponse:
+    """
+    Минимальный ответ приложения, полученный прямым ASGI-вызовом.
+
+    Атрибуты:
+        status_code (int): HTTP-статус ответа.
+        body (bytes): Тело ответа.
+    """
+    status_code: int
+    body: bytes
+
+    def json(self) -> Any:
+        """Разбор тела ответа как JSON."""
+        return orjson.loads(self.body)
+
+
+async def asgi_post(
+        path: str,
+        json: Any = None,
+        headers: dict[str, str] | None = None,
+        form: dict[str, str] | None = None,
+) -> ASGIResponse:
     """
-    Регистрирует и логинит пользователя. Возвращает access_token.
+    Выполняет POST-запрос напрямую к ASGI-приложению, минуя httpx.
+
+    Используется в самых частых вспомогательных функциях тестов, где накладные
+    расходы httpx (построение запроса/ответа, разбор URL и заголовков) заметны.
+
+    Аргументы:
+        path (str): Путь запроса.
+        json (Any): Тело запроса в формате JSON.
+        headers (dict[str, str] | None): Дополнительные заголовки.
+        form (dict[str, str] | None): Данные формы (application/x-www-form-urlencoded).
+
+    Возвращает:
+        ASGIResponse: Статус и тело ответа.
+    """
+    if form is not None:
+        body = urlencode(form).encode()
+        content_type = b"application/x-www-form-urlencoded"
+    else:
+        body = orjson.dumps(json)
+        content_type = b"application/json"
+
+    raw_headers = [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+    raw_headers += [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 123),
+        "server": ("test", 80),
+    }
+    request_messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status_code = 0
+    chunks = []
+
+    async def receive() -> dict:
+        if request_messages:
+            return request_messages.pop()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+
+    return ASGIResponse(status_code=status_code, body=b"".join(chunks))
+
+
+async def register_and_login(client: AsyncClient, username: str, email: str, password: str) -> tuple[str, int]:
+    """
+    Регистрирует и логинит пользователя. Возвращает access_token и ID пользователя.
+
+    ID берётся из ответа регистрации, поэтому отдельный запрос к /users/me не нужен.
+
+    Запросы выполняются прямым ASGI-вызовом (см. asgi_post); клиент передаётся,
+    чтобы тест гарантированно использовал фикстуру с тестовой базой данных.
 
     Аргументы:
         client (AsyncClient): Тестовый HTTP-клиент.
@@ -55,16 +347,16 @@ async def register_and_login(client: AsyncClient, username: str, email: str, pas
         password (str): Пароль.
 
     Возвращает:
-        str: JWT токен доступа.
+        tuple[str, int]: JWT токен доступа и ID пользователя.
     """
-    register_response = await client.post("/users/register", json={
+    register_response = await asgi_post("/users/register", json={
         "username": username,
         "email": email,
         "password": password
     })
     assert register_response.status_code == 201
 
-    login_response = await client.post("/users/login", data={
+    login_response = await asgi_post("/users/login", form={
         "username": username,
         "password": password
     })
@@ -72,4 +364,26 @@ async def register_and_login(client: AsyncClient, username: str, email: str, pas
 
     token_data = login_response.json()
     assert "access_token" in token_data
-    return token_data["access_token"]
+    return token_data["access_token"], register_response.json()["id"]
+
+
+async def login_as(client: AsyncClient, idx: int) -> str:
+    """
+    Логинит заранее созданного пользователя. Возвращает access_token.
+
+    Подходит для тестов, которым не нужен только что зарегистрированный
+    пользователь; его ID можно взять из фикстуры seeded_users.
+
+    Аргументы:
+        client (AsyncClient): Тестовый HTTP-клиент.
+        idx (int): Номер пользователя от 0 до SEED_USERS_COUNT - 1.
+
+    Возвращает:
+        str: JWT токен доступа.
+    """
+    login_response = await asgi_post("/users/login", form={
+        "username": seed_username(idx),
+        "password": SEED_PASSWORD
+    })
+    assert login_response.status_code == 200
+    return login_response.json()["access_token"]
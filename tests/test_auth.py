@@ -1,8 +1,13 @@
 """Тесты для маршрутов пользователей: регистрация, логин, получение текущего пользователя и валидация ошибок."""
 
 import pytest
+from passlib.context import CryptContext
+from passlib.hash import hex_md5
+from sqlalchemy import select, update
 
-from tests.conftest import register_and_login
+from app.core import security
+from app.models.user import User
+from tests.conftest import SEED_PASSWORD, register_and_login, seed_username
 
 
 @pytest.mark.asyncio
@@ -10,13 +15,14 @@ async def test_register_and_login(async_client) -> None:
     """
     Проверка успешной регистрации и получения токена.
     """
-    token = await register_and_login(
+    token, user_id = await register_and_login(
         async_client,
         username="testuser",
         email="testuser@example.com",
         password="1234"
     )
     assert token
+    assert isinstance(user_id, int)
 
 
 @pytest.mark.asyncio
@@ -24,7 +30,7 @@ async def test_get_current_user(async_client) -> None:
     """
     Проверка получения текущего пользователя по валидному токену.
     """
-    token = await register_and_login(
+    token, user_id = await register_and_login(
         async_client,
         username="meuser",
         email="meuser@example.com",
@@ -38,6 +44,7 @@ async def test_get_current_user(async_client) -> None:
 
     assert me_response.status_code == 200
     me_data = me_response.json()
+    assert me_data["id"] == user_id
     assert me_data["username"] == "meuser"
     assert me_data["email"] == "meuser@example.com"
 
@@ -61,6 +68,40 @@ async def test_register_existing_user(async_client) -> None:
     assert response.status_code == 409
 
 
+@pytest.mark.asyncio
+async def test_register_invalid_email(async_client) -> None:
+    """
+    Проверка ошибки валидации при регистрации с некорректным email.
+    """
+    response = await async_client.post("/users/register", json={
+        "username": "bademail",
+        "email": "not-an-email",
+        "password": "1234"
+    })
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_register_email_domain_case_conflict(async_client) -> None:
+    """
+    Проверка, что email с тем же адресом, но доменом в другом регистре, считается занятым.
+    """
+    first = await async_client.post("/users/register", json={
+        "username": "casefirst",
+        "email": "Q@EXAMPLE.com",
+        "password": "1234"
+    })
+    assert first.status_code == 201
+    assert first.json()["email"] == "Q@example.com"
+
+    second = await async_client.post("/users/register", json={
+        "username": "casesecond",
+        "email": "Q@example.com",
+        "password": "1234"
+    })
+    assert second.status_code == 409
+
+
 @pytest.mark.asyncio
 async def test_login_invalid_password(async_client) -> None:
     """
@@ -97,6 +138,29 @@ async def test_login_invalid_username(async_client) -> None:
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_login_rehashes_deprecated_hash(async_client, db_connection, seeded_users, monkeypatch) -> None:
+    """
+    Проверка замены хеша устаревшего алгоритма при успешном логине.
+
+    Роль argon2/bcrypt играют быстрые hex_sha256/hex_md5 с тем же deprecated="auto".
+    """
+    context = CryptContext(schemes=["hex_sha256", "hex_md5"], deprecated="auto")
+    monkeypatch.setattr(security, "pwd_context", context)
+
+    user_id = seeded_users[0]
+    await db_connection.execute(
+        update(User).where(User.id == user_id).values(hashed_password=hex_md5.hash(SEED_PASSWORD))
+    )
+
+    response = await async_client.post("/users/login", data={"username": seed_username(0), "password": SEED_PASSWORD})
+    assert response.status_code == 200
+
+    stored_hash = await db_connection.scalar(select(User.hashed_password).where(User.id == user_id))
+    assert context.identify(stored_hash) == "hex_sha256"
+    assert context.verify(SEED_PASSWORD, stored_hash)
+
+
 @pytest.mark.asyncio
 async def test_refresh_token(async_client):
     # Регистрация и логин
@@ -2,7 +2,7 @@
 
 import pytest
 
-from tests.conftest import register_and_login
+from tests.conftest import login_as
 
 
 @pytest.mark.asyncio
@@ -10,7 +10,7 @@ async def test_create_task_success(async_client) -> None:
     """
     Проверка успешного создания задачи авторизованным пользователем.
     """
-    token = await register_and_login(async_client, "taskuser", "task@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
     task_data = {"title": "Test Task", "description": "Test Description", "status": "IN_PROGRESS"}
 
@@ -25,6 +25,22 @@ async def test_create_task_success(async_client) -> None:
     assert "user_id" in data
 
 
+@pytest.mark.asyncio
+async def test_create_task_default_status(async_client) -> None:
+    """
+    Проверка статуса по умолчанию в ответе на создание задачи без статуса.
+    """
+    token = await login_as(async_client, 0)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.post("/tasks", json={"title": "No status"}, headers=headers)
+    assert response.status_code == 201
+
+    data = response.json()
+    assert data["status"] == "NEW"
+    assert data["description"] is None
+
+
 @pytest.mark.asyncio
 async def test_create_task_unauthorized(async_client) -> None:
     """
@@ -36,12 +52,12 @@ async def test_create_task_unauthorized(async_client) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_all_tasks_only_own(async_client) -> None:
+async def test_get_all_tasks_only_own(async_client, seeded_users) -> None:
     """
     Проверка получения только своих задач.
     """
-    token1 = await register_and_login(async_client, "user1", "user1@example.com", "1234")
-    token2 = await register_and_login(async_client, "user2", "user2@example.com", "1234")
+    token1 = await login_as(async_client, 0)
+    token2 = await login_as(async_client, 1)
     headers1 = {"Authorization": f"Bearer {token1}"}
     headers2 = {"Authorization": f"Bearer {token2}"}
 
@@ -49,17 +65,28 @@ async def test_get_all_tasks_only_own(async_client) -> None:
     await async_client.post("/tasks", json={"title": "first_user_task"}, headers=headers1)
     await async_client.post("/tasks", json={"title": "second_user_task"}, headers=headers2)
 
-    me_response = await async_client.get("/users/me", headers=headers1)
-    user1_id = me_response.json()["id"]
-
     response = await async_client.get("/tasks", headers=headers1)
     assert response.status_code == 200
     tasks = response.json()
 
     assert len(tasks) == 2
     for task in tasks:
-        assert task["user_id"] == user1_id
+        assert task["user_id"] == seeded_users[0]
         assert task["title"].startswith("first")
+        assert task["status"] == "NEW"
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_empty(async_client) -> None:
+    """
+    Проверка получения пустого списка задач у пользователя без задач.
+    """
+    token = await login_as(async_client, 0)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.get("/tasks", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == []
 
 
 @pytest.mark.asyncio
@@ -67,7 +94,7 @@ async def test_get_task_by_id_success(async_client) -> None:
     """
     Проверка успешного получения задачи по ID.
     """
-    token = await register_and_login(async_client, "taskreader", "reader@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
 
     create_resp = await async_client.post("/tasks", json={"title": "pass"}, headers=headers)
@@ -83,8 +110,8 @@ async def test_get_task_forbidden(async_client) -> None:
     """
     Проверка запрета на просмотр чужой задачи.
     """
-    token1 = await register_and_login(async_client, "owner", "owner@example.com", "1234")
-    token2 = await register_and_login(async_client, "stranger", "stranger@example.com", "1234")
+    token1 = await login_as(async_client, 0)
+    token2 = await login_as(async_client, 1)
     headers1 = {"Authorization": f"Bearer {token1}"}
     headers2 = {"Authorization": f"Bearer {token2}"}
 
@@ -100,7 +127,7 @@ async def test_get_task_not_found(async_client) -> None:
     """
     Проверка ошибки при запросе несуществующей задачи.
     """
-    token = await register_and_login(async_client, "taskreader", "reader@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
     resp = await async_client.get("/tasks/9999", headers=headers)
     assert resp.status_code == 404
@@ -111,7 +138,7 @@ async def test_update_own_task(async_client) -> None:
     """
     Проверка успешного обновления своей задачи.
     """
-    token = await register_and_login(async_client, "taskreader", "reader@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
 
     create_resp = await async_client.post("/tasks", json={"title": "old_task"}, headers=headers)
@@ -136,8 +163,8 @@ async def test_update_other_task_forbidden(async_client) -> None:
     """
     Проверка запрета на обновление чужой задачи.
     """
-    token1 = await register_and_login(async_client, "owner", "owner@example.com", "1234")
-    token2 = await register_and_login(async_client, "intruder", "intruder@example.com", "1234")
+    token1 = await login_as(async_client, 0)
+    token2 = await login_as(async_client, 1)
     headers1 = {"Authorization": f"Bearer {token1}"}
     headers2 = {"Authorization": f"Bearer {token2}"}
 
@@ -153,7 +180,7 @@ async def test_update_task_not_found(async_client) -> None:
     """
     Проверка обновления несуществующей задачи.
     """
-    token = await register_and_login(async_client, "ghost", "ghost@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
 
     resp = await async_client.put("/tasks/9999", json={"title": "Nothing"}, headers=headers)
@@ -165,7 +192,7 @@ async def test_delete_own_task(async_client) -> None:
     """
     Проверка успешного удаления своей задачи.
     """
-    token = await register_and_login(async_client, "deleter", "deleter@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
 
     create_resp = await async_client.post("/tasks", json={"title": "To delete"}, headers=headers)
@@ -183,8 +210,8 @@ async def test_delete_other_task_forbidden(async_client) -> None:
     """
     Проверка запрета на удаление чужой задачи.
     """
-    token1 = await register_and_login(async_client, "owner", "owner@example.com", "1234")
-    token2 = await register_and_login(async_client, "attacker", "attacker@example.com", "1234")
+    token1 = await login_as(async_client, 0)
+    token2 = await login_as(async_client, 1)
     headers1 = {"Authorization": f"Bearer {token1}"}
     headers2 = {"Authorization": f"Bearer {token2}"}
 
@@ -200,7 +227,7 @@ async def test_delete_task_not_found(async_client) -> None:
     """
     Проверка удаления несуществующей задачи.
     """
-    token = await register_and_login(async_client, "ghost", "ghost@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
 
     resp = await async_client.delete("/tasks/9999", headers=headers)
@@ -1,26 +1,24 @@
 """Тесты для маршрутов пользователей: регистрация, авторизация, чтение, обновление и удаление."""
 
 import pytest
+from sqlalchemy import func, select
 
-from tests.conftest import register_and_login
+from app.models.task import Task
+from tests.conftest import SEED_USERS_COUNT, login_as, seed_username
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_id_authorized(async_client) -> None:
+async def test_get_user_by_id_authorized(async_client, seeded_users) -> None:
     """
     Тестирует получение данных другого пользователя по ID при наличии авторизации.
     """
-    token1 = await register_and_login(async_client, "user1", "user1@example.com", "1234")
-    token2 = await register_and_login(async_client, "user2", "user2@example.com", "1234")
-
-    headers2 = {"Authorization": f"Bearer {token2}"}
-    user2_id = (await async_client.get("/users/me", headers=headers2)).json()["id"]
+    token1 = await login_as(async_client, 0)
 
     headers1 = {"Authorization": f"Bearer {token1}"}
-    response = await async_client.get(f"/users/{user2_id}", headers=headers1)
+    response = await async_client.get(f"/users/{seeded_users[1]}", headers=headers1)
 
     assert response.status_code == 200
-    assert response.json()["username"] == "user2"
+    assert response.json()["username"] == seed_username(1)
 
 
 @pytest.mark.asyncio
@@ -37,22 +35,25 @@ async def test_get_users_list(async_client) -> None:
     """
     Тестирует получение списка всех пользователей авторизованным пользователем.
     """
-    token = await register_and_login(async_client, "listuser", "list@example.com", "1234")
+    token = await login_as(async_client, 0)
     headers = {"Authorization": f"Bearer {token}"}
 
     response = await async_client.get("/users", headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    users = response.json()
+    assert isinstance(users, list)
+    assert [user["username"] for user in users] == [seed_username(idx) for idx in range(SEED_USERS_COUNT)]
+    assert {"username": "seed0", "email": "seed0@example.com"}.items() <= users[0].items()
 
 
 @pytest.mark.asyncio
-async def test_update_own_user(async_client) -> None:
+async def test_update_own_user(async_client, seeded_users) -> None:
     """
     Тестирует успешное обновление данных собственного пользователя.
     """
-    token = await register_and_login(async_client, "editme", "editme@example.com", "1234")
+    token = await login_as(async_client, 0)
+    user_id = seeded_users[0]
     headers = {"Authorization": f"Bearer {token}"}
-    user_id = (await async_client.get("/users/me", headers=headers)).json()["id"]
 
     update_data = {"username": "edited", "email": "new_email@example.com"}
     response = await async_client.put(f"/users/{user_id}", json=update_data, headers=headers)
@@ -64,36 +65,67 @@ async def test_update_own_user(async_client) -> None:
 
 
 @pytest.mark.asyncio
-async def test_update_other_user_forbidden(async_client) -> None:
+async def test_update_own_user_visible_with_same_token(async_client, seeded_users) -> None:
     """
-    Тестирует запрет на обновление данных чужого пользователя (403).
+    Тестирует, что после обновления /users/me с тем же токеном отдаёт новые данные, а не кеш.
     """
-    token1 = await register_and_login(async_client, "user1", "user1@example.com", "1234")
-    token2 = await register_and_login(async_client, "user2", "user2@example.com", "1234")
+    token = await login_as(async_client, 0)
+    headers = {"Authorization": f"Bearer {token}"}
 
-    headers1 = {"Authorization": f"Bearer {token1}"}
-    user1_id = (await async_client.get("/users/me", headers=headers1)).json()["id"]
+    before = await async_client.get("/users/me", headers=headers)
+    assert before.json()["username"] == seed_username(0)
+
+    response = await async_client.put(f"/users/{seeded_users[0]}", json={"username": "renamed"}, headers=headers)
+    assert response.status_code == 200
+
+    after = await async_client.get("/users/me", headers=headers)
+    assert after.status_code == 200
+    assert after.json()["username"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_update_own_password(async_client, seeded_users) -> None:
+    """
+    Тестирует смену пароля: после обновления вход возможен только с новым паролем.
+    """
+    token = await login_as(async_client, 0)
+    user_id = seeded_users[0]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await async_client.put(f"/users/{user_id}", json={"password": "5678"}, headers=headers)
+    assert response.status_code == 200
+
+    old_login = await async_client.post("/users/login", data={"username": "seed0", "password": "1234"})
+    assert old_login.status_code == 401
+
+    new_login = await async_client.post("/users/login", data={"username": "seed0", "password": "5678"})
+    assert new_login.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_update_other_user_forbidden(async_client, seeded_users) -> None:
+    """
+    Тестирует запрет на обновление данных чужого пользователя (403).
+    """
+    token2 = await login_as(async_client, 1)
 
     headers2 = {"Authorization": f"Bearer {token2}"}
-    response = await async_client.put(f"/users/{user1_id}", json={"username": "hacked"}, headers=headers2)
+    response = await async_client.put(f"/users/{seeded_users[0]}", json={"username": "hacked"}, headers=headers2)
 
     assert response.status_code == 403
 
 
 @pytest.mark.asyncio
-async def test_update_user_conflict(async_client) -> None:
+async def test_update_user_conflict(async_client, seeded_users) -> None:
     """
     Тестирует обновление с конфликтом уникальности username/email (409).
     """
-    token1 = await register_and_login(async_client, "user1", "user1@example.com", "1234")
-    token2 = await register_and_login(async_client, "user2", "user2@example.com", "1234")
+    token2 = await login_as(async_client, 1)
 
     headers2 = {"Authorization": f"Bearer {token2}"}
-    user2_id = (await async_client.get("/users/me", headers=headers2)).json()["id"]
-
     response = await async_client.put(
-        f"/users/{user2_id}",
-        json={"username": "user1"},
+        f"/users/{seeded_users[1]}",
+        json={"username": seed_username(0)},
         headers=headers2
     )
     assert response.status_code == 409
@@ -109,13 +141,13 @@ async def test_update_user_unauthorized(async_client) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete_own_user(async_client) -> None:
+async def test_delete_own_user(async_client, seeded_users) -> None:
     """
     Тестирует успешное удаление собственного пользователя.
     """
-    token = await register_and_login(async_client, "delme", "delme@example.com", "1234")
+    token = await login_as(async_client, 0)
+    user_id = seeded_users[0]
     headers = {"Authorization": f"Bearer {token}"}
-    user_id = (await async_client.get("/users/me", headers=headers)).json()["id"]
 
     delete_response = await async_client.delete(f"/users/{user_id}", headers=headers)
     assert delete_response.status_code == 204
@@ -125,18 +157,35 @@ async def test_delete_own_user(async_client) -> None:
 
 
 @pytest.mark.asyncio
-async def test_delete_other_user_forbidden(async_client) -> None:
+async def test_delete_user_with_tasks(async_client, db_connection, seeded_users) -> None:
     """
-    Тестирует запрет на удаление другого пользователя (403).
+    Тестирует удаление пользователя вместе с его задачами.
     """
-    token1 = await register_and_login(async_client, "user1", "user1@example.com", "1234")
-    token2 = await register_and_login(async_client, "user2", "user2@example.com", "1234")
+    token = await login_as(async_client, 0)
+    user_id = seeded_users[0]
+    headers = {"Authorization": f"Bearer {token}"}
 
-    headers1 = {"Authorization": f"Bearer {token1}"}
-    user1_id = (await async_client.get("/users/me", headers=headers1)).json()["id"]
+    await async_client.post("/tasks", json={"title": "first"}, headers=headers)
+    await async_client.post("/tasks", json={"title": "second"}, headers=headers)
+
+    count_tasks = select(func.count()).select_from(Task).where(Task.user_id == user_id)
+    assert await db_connection.scalar(count_tasks) == 2
+
+    delete_response = await async_client.delete(f"/users/{user_id}", headers=headers)
+    assert delete_response.status_code == 204
+
+    assert await db_connection.scalar(count_tasks) == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_other_user_forbidden(async_client, seeded_users) -> None:
+    """
+    Тестирует запрет на удаление другого пользователя (403).
+    """
+    token2 = await login_as(async_client, 1)
 
     headers2 = {"Authorization": f"Bearer {token2}"}
-    response = await async_client.delete(f"/users/{user1_id}", headers=headers2)
+    response = await async_client.delete(f"/users/{seeded_users[0]}", headers=headers2)
     assert response.status_code == 403
 
 